@@ -7,6 +7,7 @@ VERSÃO CORRIGIDA - Fix loop infinito
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from typing import Literal
+from functools import lru_cache
 
 from .state import MindmapState
 from .nodes.parser_node import parse_html_node
@@ -18,9 +19,15 @@ from .nodes.salvar_node import salvar_mindmap_node
 from ..utils.logger import logger
 
 
-def create_mindmap_graph():
+def create_mindmap_graph(resumable: bool = True):
     """
     Cria e configura o grafo LangGraph para geração de mapas mentais.
+    
+    Args:
+        resumable: Compila com checkpointer (MemorySaver), permitindo
+                   retomar execuções e consultar aget_state. Execuções
+                   únicas devem usar get_oneshot_graph(), que evita
+                   serializar o estado a cada node.
     """
     
     logger.info("🏗️ Criando grafo LangGraph...")
@@ -87,15 +94,26 @@ def create_mindmap_graph():
     # Edge final
     workflow.add_edge("salvar_mindmap", END)
     
-    # Compila com checkpointing
-    memory = MemorySaver()
-    app = workflow.compile(checkpointer=memory)
+    # Compila com checkpointing apenas quando a execução pode ser retomada
+    app = workflow.compile(checkpointer=MemorySaver() if resumable else None)
     
     logger.success("✅ Grafo LangGraph compilado com sucesso!")
     
     return app
 
 
+@lru_cache(maxsize=1)
+def get_oneshot_graph():
+    """
+    Retorna o grafo compilado sem checkpointer, criado uma única vez.
+    
+    Para execuções que nunca são retomadas (/process, benchmark):
+    o grafo é reutilizável entre execuções e não grava estado por node.
+    O estado final deve ser obtido do próprio stream/ainvoke.
+    """
+    return create_mindmap_graph(resumable=False)
+
+
 async def execute_graph(
     html_filename: str,
     llm01_provider: str,
@@ -105,7 +123,7 @@ async def execute_graph(
 ) -> dict:
     """Função auxiliar para executar o grafo."""
     
-    graph = create_mindmap_graph()
+    graph = get_oneshot_graph()
     
     initial_state: MindmapState = {
         "html_filename": html_filename,
@@ -21,7 +21,7 @@ async def salvar_mindmap_node(state: MindmapState) -> MindmapState:
             # Nome do arquivo: base_parte01.mmd, base_parte02.mmd, etc
             filename = f"{html_base}_parte{parte['parte_numero']:02d}.mmd"
             
-            filepath = save_mmd_file(
+            filepath = await save_mmd_file(
                 filename=filename,
                 content=parte["mapa_gerado"],
                 metadata={
@@ -7,20 +7,21 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import FileResponse
 from typing import List
 import asyncio
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 
-from ..agents.graph import create_mindmap_graph
+from ..agents.graph import get_oneshot_graph
 from ..agents.state import MindmapState
-from ..services.file_manager import save_uploaded_html, get_output_files
-from ..api.websocket import manager
+from ..services.file_manager import save_uploaded_htmls, get_output_files
+from ..services.job_store import create_job, complete_job, fail_job, get_job, spawn_job
+from ..api.websocket import manager, LogBatcher
 from ..utils.logger import logger
-from ..core.config import get_settings
+from ..core.config import VALID_PROVIDERS, get_settings
 
 router = APIRouter()
 settings = get_settings()
 
 
-@router.post("/process")
+@router.post("/process", status_code=202)
 async def process_htmls(
     files: List[UploadFile] = File(...),
     llm01_provider: str = Form(...),
@@ -28,35 +29,70 @@ async def process_htmls(
     llm03_provider: str = Form(...)
 ):
     """
-    Processa arquivos HTML e gera mapas mentais.
-    VERSÃO CORRIGIDA: Envia progresso real via WebSocket
+    Recebe arquivos HTML e agenda a geração dos mapas mentais.
+    
+    Responde 202 imediatamente com o job_id; o progresso e a conclusão
+    são enviados via WebSocket (mensagens marcadas com job_id) e o
+    resultado final fica disponível em GET /api/jobs/{job_id}.
     """
     
     try:
         logger.info(f"Recebidos {len(files)} arquivos para processamento")
         
         # Valida providers
-        valid_providers = ["openai", "anthropic", "gemini", "deepseek"]
-        for provider in [llm01_provider, llm02_provider, llm03_provider]:
-            if provider not in valid_providers:
+        for provider in (llm01_provider, llm02_provider, llm03_provider):
+            if provider not in VALID_PROVIDERS:
                 raise HTTPException(400, f"Provider inválido: {provider}")
         
-        # Salva arquivos enviados
-        uploaded_files = []
-        for file in files:
-            if not file.filename.endswith('.html'):
-                continue
-            
-            content = await file.read()
-            filepath = save_uploaded_html(content, file.filename)
-            uploaded_files.append(file.filename)
-            logger.info(f"Arquivo salvo: {file.filename}")
+        # Salva arquivos enviados (antes de responder: o UploadFile
+        # é fechado ao fim da requisição)
+        uploaded_files = await save_uploaded_htmls(files)
+        for filename in uploaded_files:
+            logger.info(f"Arquivo salvo: {filename}")
         
         if not uploaded_files:
             raise HTTPException(400, "Nenhum arquivo HTML válido encontrado")
         
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro ao receber arquivos: {str(e)}")
+        raise HTTPException(500, str(e))
+    
+    job_id = create_job("sequential", uploaded_files)
+    spawn_job(_run_job(job_id, uploaded_files, llm01_provider, llm02_provider, llm03_provider))
+    
+    logger.info(f"🆔 Job {job_id} agendado ({len(uploaded_files)} arquivo(s))")
+    
+    return {
+        "status": "accepted",
+        "job_id": job_id,
+        "total_files": len(uploaded_files)
+    }
+
+
+async def _run_job(
+    job_id: str,
+    uploaded_files: List[str],
+    llm01_provider: str,
+    llm02_provider: str,
+    llm03_provider: str
+):
+    """
+    Executa o pipeline sequencial em background.
+    
+    Todas as mensagens WebSocket levam o job_id para que o frontend
+    filtre apenas as atualizações do seu próprio job.
+    """
+    
+    # Logs por node são agrupados em frames "log_batch"
+    batcher = LogBatcher(manager)
+    batcher.start()
+    
+    try:
         # Envia progresso inicial
         await manager.send_progress({
+            "job_id": job_id,
             "stage": "parsing",
             "current_step": 0,
             "total_steps": len(uploaded_files) * 5,  # 5 etapas por arquivo
@@ -77,6 +113,7 @@ async def process_htmls(
                 # === PARSING ===
                 step_counter += 1
                 await manager.send_progress({
+                    "job_id": job_id,
                     "stage": "parsing",
                     "current_step": step_counter,
                     "total_steps": total_steps,
@@ -85,14 +122,15 @@ async def process_htmls(
                     "html_file": filename
                 })
                 
-                await manager.send_log({
+                batcher.push({
+                    "job_id": job_id,
                     "level": "info",
                     "message": f"📄 Parsing HTML: {filename}",
                     "node": "parse_html"
                 })
                 
-                # Cria o grafo LangGraph
-                graph = create_mindmap_graph()
+                # Grafo compilado sem checkpointer (execução única)
+                graph = get_oneshot_graph()
                 
                 # Estado inicial
                 initial_state: MindmapState = {
@@ -117,6 +155,7 @@ async def process_htmls(
                 # === DIVISÃO ===
                 step_counter += 1
                 await manager.send_progress({
+                    "job_id": job_id,
                     "stage": "dividindo",
                     "current_step": step_counter,
                     "total_steps": total_steps,
@@ -125,18 +164,27 @@ async def process_htmls(
                     "html_file": filename
                 })
                 
-                await manager.send_log({
+                batcher.push({
+                    "job_id": job_id,
                     "level": "info",
                     "message": f"🤖 LLM01 ({llm01_provider}): Analisando conteúdo...",
                     "node": "dividir_conteudo"
                 })
                 
-                # Executa o grafo com streaming
+                # Executa o grafo com streaming; o modo "values" entrega o
+                # estado completo após cada passo, e o último é o estado final
                 current_node = ""
                 num_partes = 0
                 partes_concluidas = 0
+                final_values = initial_state
                 
-                async for event in graph.astream(initial_state, config):
+                async for mode, event in graph.astream(
+                    initial_state, config, stream_mode=["updates", "values"]
+                ):
+                    if mode == "values":
+                        final_values = event
+                        continue
+                    
                     # Detecta qual node está executando
                     if "__end__" not in event:
                         for node_name, node_data in event.items():
@@ -151,6 +199,7 @@ async def process_htmls(
                                 
                                 step_counter += 0.5
                                 await manager.send_progress({
+                                    "job_id": job_id,
                                     "stage": "gerando",
                                     "current_step": int(step_counter),
                                     "total_steps": total_steps,
@@ -159,7 +208,8 @@ async def process_htmls(
                                     "html_file": filename
                                 })
                                 
-                                await manager.send_log({
+                                batcher.push({
+                                    "job_id": job_id,
                                     "level": "info",
                                     "message": f"🎨 LLM02 ({llm02_provider}): Gerando mapa {partes_concluidas + 1}/{num_partes}",
                                     "node": "gerar_mindmap"
@@ -169,6 +219,7 @@ async def process_htmls(
                             elif node_name == "revisar_mindmap":
                                 step_counter += 0.3
                                 await manager.send_progress({
+                                    "job_id": job_id,
                                     "stage": "revisando",
                                     "current_step": int(step_counter),
                                     "total_steps": total_steps,
@@ -177,7 +228,8 @@ async def process_htmls(
                                     "html_file": filename
                                 })
                                 
-                                await manager.send_log({
+                                batcher.push({
+                                    "job_id": job_id,
                                     "level": "info",
                                     "message": f"🔍 LLM03 ({llm03_provider}): Revisando mapa {partes_concluidas + 1}/{num_partes}",
                                     "node": "revisar_mindmap"
@@ -187,6 +239,7 @@ async def process_htmls(
                             elif node_name == "salvar_mindmap":
                                 step_counter = file_index * 5  # Completa os steps deste arquivo
                                 await manager.send_progress({
+                                    "job_id": job_id,
                                     "stage": "salvando",
                                     "current_step": step_counter,
                                     "total_steps": total_steps,
@@ -195,32 +248,30 @@ async def process_htmls(
                                     "html_file": filename
                                 })
                                 
-                                await manager.send_log({
+                                batcher.push({
+                                    "job_id": job_id,
                                     "level": "success",
                                     "message": f"💾 Salvando mapas mentais...",
                                     "node": "salvar_mindmap"
                                 })
                 
-                # Pega estado final
-                final_state = await graph.aget_state(config)
-                
-                if final_state.values["status"] == "concluido":
-                    arquivos_gerados = []
-                    html_base = filename.replace('.html', '')
-                    
-                    for parte in final_state.values["partes_processadas"]:
-                        mmd_filename = f"{html_base}_parte{parte['parte_numero']:02d}.mmd"
-                        arquivos_gerados.append(mmd_filename)
+                if final_values["status"] == "concluido":
+                    html_base = PurePosixPath(filename).stem
+                    arquivos_gerados = [
+                        f"{html_base}_parte{parte['parte_numero']:02d}.mmd"
+                        for parte in final_values["partes_processadas"]
+                    ]
                     
                     results.append({
                         "file": filename,
                         "success": True,
-                        "parts": len(final_state.values["partes_processadas"]),
+                        "parts": len(final_values["partes_processadas"]),
                         "files_generated": arquivos_gerados,
-                        "logs": final_state.values["logs"]
+                        "logs": final_values["logs"]
                     })
                     
-                    await manager.send_log({
+                    batcher.push({
+                        "job_id": job_id,
                         "level": "success",
                         "message": f"✅ {filename}: {len(arquivos_gerados)} arquivo(s) gerado(s)",
                         "node": "completion"
@@ -230,13 +281,14 @@ async def process_htmls(
                     results.append({
                         "file": filename,
                         "success": False,
-                        "error": final_state.values.get("erro_msg", "Erro desconhecido"),
+                        "error": final_values.get("erro_msg", "Erro desconhecido"),
                         "files_generated": []
                     })
                     
-                    await manager.send_log({
+                    batcher.push({
+                        "job_id": job_id,
                         "level": "error",
-                        "message": f"❌ {filename}: {final_state.values.get('erro_msg', 'Erro')}",
+                        "message": f"❌ {filename}: {final_values.get('erro_msg', 'Erro')}",
                         "node": "error"
                     })
                     
@@ -249,14 +301,18 @@ async def process_htmls(
                     "files_generated": []
                 })
                 
-                await manager.send_log({
+                batcher.push({
+                    "job_id": job_id,
                     "level": "error",
                     "message": f"❌ Erro em {filename}: {str(e)}",
                     "node": "error"
                 })
         
+        await batcher.flush()
+        
         # Progresso final
         await manager.send_progress({
+            "job_id": job_id,
             "stage": "salvando",
             "current_step": total_steps,
             "total_steps": total_steps,
@@ -271,32 +327,62 @@ async def process_htmls(
             if result["success"]:
                 all_files_generated.extend(result.get("files_generated", []))
         
+        result = {
+            "status": "completed",
+            "total_files": len(uploaded_files),
+            "results": results,
+            "files_generated": all_files_generated,
+            "output_directory": settings.output_dir
+        }
+        complete_job(job_id, result)
+        
         # Notificação de conclusão
         await manager.send_completion({
+            "job_id": job_id,
             "success": True,
             "files_generated": all_files_generated,
             "total_files": len(all_files_generated),
             "output_dir": settings.output_dir
         })
         
-        return {
-            "status": "completed",
-            "total_files": len(uploaded_files),
-            "results": results,
-            "files_generated": all_files_generated,
-            "output_directory": settings.output_dir
-        }
-        
     except Exception as e:
         logger.error(f"Erro no processamento: {str(e)}")
+        fail_job(job_id, str(e))
+        await batcher.flush()
         
         await manager.send_log({
+            "job_id": job_id,
             "level": "error",
             "message": f"❌ Erro crítico: {str(e)}",
             "node": "error"
         })
         
-        raise HTTPException(500, str(e))
+        await manager.send_completion({
+            "job_id": job_id,
+            "success": False,
+            "files_generated": [],
+            "total_files": 0,
+            "output_dir": settings.output_dir,
+            "error": str(e)
+        })
+    
+    finally:
+        await batcher.close()
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """
+    Consulta status e resultado de um job de processamento.
+    
+    Alternativa ao WebSocket para clientes que não mantêm a conexão.
+    """
+    job = get_job(job_id)
+    
+    if job is None:
+        raise HTTPException(404, f"Job não encontrado ou expirado: {job_id}")
+    
+    return job
 
 
 @router.get("/outputs")
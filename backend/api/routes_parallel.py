@@ -6,22 +6,24 @@ Rotas da API com processamento PARALELO.
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from typing import List
 import asyncio
-from pathlib import Path
+from itertools import chain
+from pathlib import Path, PurePosixPath
 
 from ..agents.graph_parallel import (
     execute_graph_parallel,
     processar_multiplos_htmls_paralelo
 )
-from ..services.file_manager import save_uploaded_html
+from ..services.file_manager import save_uploaded_htmls
+from ..services.job_store import create_job, complete_job, fail_job, spawn_job
 from ..api.websocket import manager
 from ..utils.logger import logger
-from ..core.config import get_settings
+from ..core.config import VALID_PROVIDERS, get_settings
 
 router = APIRouter()
 settings = get_settings()
 
 
-@router.post("/process-parallel")
+@router.post("/process-parallel", status_code=202)
 async def process_htmls_parallel(
     files: List[UploadFile] = File(...),
     llm01_provider: str = Form(...),
@@ -31,7 +33,10 @@ async def process_htmls_parallel(
     max_concurrent_files: int = Form(2)    # Arquivos simultâneos
 ):
     """
-    Processa arquivos HTML com PARALELIZAÇÃO.
+    Agenda o processamento de arquivos HTML com PARALELIZAÇÃO.
+    
+    Responde 202 imediatamente com o job_id; progresso e conclusão
+    chegam via WebSocket e o resultado fica em GET /api/jobs/{job_id}.
     
     Configurações de performance:
     - max_workers_per_file: Quantas partes processar simultaneamente por arquivo (1-5)
@@ -46,9 +51,8 @@ async def process_htmls_parallel(
         logger.info(f"📥 Recebidos {len(files)} arquivo(s) para processamento PARALELO")
         
         # Valida providers
-        valid_providers = ["openai", "anthropic", "gemini", "deepseek"]
-        for provider in [llm01_provider, llm02_provider, llm03_provider]:
-            if provider not in valid_providers:
+        for provider in (llm01_provider, llm02_provider, llm03_provider):
+            if provider not in VALID_PROVIDERS:
                 raise HTTPException(400, f"Provider inválido: {provider}")
         
         # Valida configurações de paralelização
@@ -58,22 +62,61 @@ async def process_htmls_parallel(
         if not (1 <= max_concurrent_files <= 5):
             raise HTTPException(400, "max_concurrent_files deve estar entre 1 e 3")
         
-        # Salva arquivos
-        uploaded_files = []
-        for file in files:
-            if not file.filename.endswith('.html'):
-                continue
-            
-            content = await file.read()
-            save_uploaded_html(content, file.filename)
-            uploaded_files.append(file.filename)
-            logger.info(f"💾 Arquivo salvo: {file.filename}")
+        # Salva arquivos (antes de responder: o UploadFile é fechado
+        # ao fim da requisição)
+        uploaded_files = await save_uploaded_htmls(files)
+        for filename in uploaded_files:
+            logger.info(f"💾 Arquivo salvo: {filename}")
         
         if not uploaded_files:
             raise HTTPException(400, "Nenhum arquivo HTML válido encontrado")
         
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ Erro ao receber arquivos: {str(e)}")
+        raise HTTPException(500, str(e))
+    
+    job_id = create_job("parallel", uploaded_files)
+    spawn_job(_run_parallel_job(
+        job_id,
+        uploaded_files,
+        llm01_provider,
+        llm02_provider,
+        llm03_provider,
+        max_workers_per_file,
+        max_concurrent_files
+    ))
+    
+    logger.info(f"🆔 Job {job_id} agendado ({len(uploaded_files)} arquivo(s), modo paralelo)")
+    
+    return {
+        "status": "accepted",
+        "mode": "parallel",
+        "job_id": job_id,
+        "total_files": len(uploaded_files)
+    }
+
+
+async def _run_parallel_job(
+    job_id: str,
+    uploaded_files: List[str],
+    llm01_provider: str,
+    llm02_provider: str,
+    llm03_provider: str,
+    max_workers_per_file: int,
+    max_concurrent_files: int
+):
+    """
+    Executa o pipeline paralelo em background.
+    
+    Todas as mensagens WebSocket levam o job_id do job.
+    """
+    
+    try:
         # Progresso inicial
         await manager.send_progress({
+            "job_id": job_id,
             "stage": "parsing",
             "current_step": 0,
             "total_steps": len(uploaded_files) * 4,  # 4 etapas: parse, divide, gera+revisa, salva
@@ -83,6 +126,7 @@ async def process_htmls_parallel(
         })
         
         await manager.send_log({
+            "job_id": job_id,
             "level": "info",
             "message": (
                 f"🚀 Modo PARALELO ativado:\n"
@@ -110,87 +154,24 @@ async def process_htmls_parallel(
         # PROCESSA RESULTADOS
         # ============================================
         
-        results = []
-        all_files_generated = []
-        
-        for i, (filename, state) in enumerate(zip(uploaded_files, resultados)):
-            
-            # Progresso
-            current_step = (i + 1) * 4
-            await manager.send_progress({
-                "stage": "salvando",
-                "current_step": current_step,
-                "total_steps": len(uploaded_files) * 4,
-                "message": f"Finalizado: {filename}",
-                "percentage": int((current_step / (len(uploaded_files) * 4)) * 100),
-                "html_file": filename
-            })
-            
-            # Verifica se houve erro
-            if isinstance(state, Exception):
-                logger.error(f"❌ {filename}: {state}")
-                results.append({
-                    "file": filename,
-                    "success": False,
-                    "error": str(state),
-                    "files_generated": []
-                })
-                
-                await manager.send_log({
-                    "level": "error",
-                    "message": f"❌ {filename}: {str(state)}",
-                    "node": "error"
-                })
-                continue
-            
-            # Sucesso
-            if state["status"] in ["concluido", "parcial"]:
-                arquivos_gerados = []
-                html_base = filename.replace('.html', '')
-                
-                for parte in state["partes_processadas"]:
-                    if parte.get("aprovado"):
-                        mmd_filename = f"{html_base}_parte{parte['parte_numero']:02d}.mmd"
-                        arquivos_gerados.append(mmd_filename)
-                
-                all_files_generated.extend(arquivos_gerados)
-                
-                results.append({
-                    "file": filename,
-                    "success": True,
-                    "parts": len(state["partes_processadas"]),
-                    "files_generated": arquivos_gerados,
-                    "logs": state.get("logs", [])
-                })
-                
-                await manager.send_log({
-                    "level": "success",
-                    "message": (
-                        f"✅ {filename}: {len(arquivos_gerados)} arquivo(s) gerado(s) "
-                        f"em {len(state['partes_processadas'])} parte(s)"
-                    ),
-                    "node": "completion"
-                })
-            else:
-                # Erro
-                results.append({
-                    "file": filename,
-                    "success": False,
-                    "error": state.get("erro_msg", "Erro desconhecido"),
-                    "files_generated": []
-                })
-                
-                await manager.send_log({
-                    "level": "error",
-                    "message": f"❌ {filename}: {state.get('erro_msg', 'Erro')}",
-                    "node": "error"
-                })
+        # Passo 1: monta os resultados (sem I/O); passo 2: um único
+        # frame de log para todos os arquivos
+        results = [
+            _build_result(filename, state)
+            for filename, state in zip(uploaded_files, resultados)
+        ]
+        all_files_generated = list(chain.from_iterable(
+            r["files_generated"] for r in results
+        ))
+        
+        await manager.send_log_batch([_result_log(job_id, r) for r in results])
         
         # ============================================
         # CONCLUSÃO
         # ============================================
         
         await manager.send_progress({
+            "job_id": job_id,
             "stage": "salvando",
             "current_step": len(uploaded_files) * 4,
             "total_steps": len(uploaded_files) * 4,
@@ -199,14 +180,7 @@ async def process_htmls_parallel(
             "html_file": ""
         })
         
-        await manager.send_completion({
-            "success": True,
-            "files_generated": all_files_generated,
-            "total_files": len(all_files_generated),
-            "output_dir": settings.output_dir
-        })
-        
-        return {
+        result = {
             "status": "completed",
             "mode": "parallel",
             "total_files": len(uploaded_files),
@@ -218,17 +192,96 @@ async def process_htmls_parallel(
                 "max_concurrent_files": max_concurrent_files
             }
         }
+        complete_job(job_id, result)
+        
+        await manager.send_completion({
+            "job_id": job_id,
+            "success": True,
+            "files_generated": all_files_generated,
+            "total_files": len(all_files_generated),
+            "output_dir": settings.output_dir
+        })
         
     except Exception as e:
         logger.error(f"❌ Erro no processamento paralelo: {str(e)}")
+        fail_job(job_id, str(e))
         
         await manager.send_log({
+            "job_id": job_id,
             "level": "error",
             "message": f"❌ Erro crítico: {str(e)}",
             "node": "error"
         })
         
-        raise HTTPException(500, str(e))
+        await manager.send_completion({
+            "job_id": job_id,
+            "success": False,
+            "files_generated": [],
+            "total_files": 0,
+            "output_dir": settings.output_dir,
+            "error": str(e)
+        })
+
+
+def _build_result(filename: str, state) -> dict:
+    """Converte o estado final (ou exceção) de um arquivo no resultado da API."""
+    
+    # Verifica se houve erro
+    if isinstance(state, Exception):
+        logger.error(f"❌ {filename}: {state}")
+        return {
+            "file": filename,
+            "success": False,
+            "error": str(state),
+            "files_generated": []
+        }
+    
+    # Sucesso
+    if state["status"] in ["concluido", "parcial"]:
+        html_base = PurePosixPath(filename).stem
+        arquivos_gerados = [
+            f"{html_base}_parte{parte['parte_numero']:02d}.mmd"
+            for parte in state["partes_processadas"]
+            if parte.get("aprovado")
+        ]
+        
+        return {
+            "file": filename,
+            "success": True,
+            "parts": len(state["partes_processadas"]),
+            "files_generated": arquivos_gerados,
+            "logs": state.get("logs", [])
+        }
+    
+    # Erro
+    return {
+        "file": filename,
+        "success": False,
+        "error": state.get("erro_msg", "Erro desconhecido"),
+        "files_generated": []
+    }
+
+
+def _result_log(job_id: str, result: dict) -> dict:
+    """Entrada de log WebSocket que resume o resultado de um arquivo."""
+    
+    if result["success"]:
+        return {
+            "job_id": job_id,
+            "level": "success",
+            "message": (
+                f"✅ {result['file']}: {len(result['files_generated'])} arquivo(s) gerado(s) "
+                f"em {result['parts']} parte(s)"
+            ),
+            "node": "completion"
+        }
+    
+    return {
+        "job_id": job_id,
+        "level": "error",
+        "message": f"❌ {result['file']}: {result['error'] or 'Erro'}",
+        "node": "error"
+    }
 
 
 @router.post("/process-benchmark")
@@ -247,12 +300,7 @@ async def benchmark_processing(
     
     try:
         # Salva arquivos
-        uploaded_files = []
-        for file in files:
-            if file.filename.endswith('.html'):
-                content = await file.read()
-                save_uploaded_html(content, file.filename)
-                uploaded_files.append(file.filename)
+        uploaded_files = await save_uploaded_htmls(files)
         
         # ============================================
         # TESTE SEQUENCIAL
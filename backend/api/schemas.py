@@ -36,7 +36,7 @@ class OutputListResponse(BaseModel):
 
 class WebSocketMessage(BaseModel):
     """Mensagem WebSocket."""
-    type: Literal["connection", "progress", "log", "completion"]
+    type: Literal["connection", "progress", "log", "log_batch", "completion"]
     timestamp: str
     data: Optional[dict] = None
 
@@ -4,22 +4,104 @@ Gerenciador de conexões WebSocket com logs de debug.
 """
 
 from fastapi import WebSocket
-from typing import List
-import json
+from typing import Dict, List, Optional, Tuple
+import asyncio
 from datetime import datetime
+import orjson
 from ..utils.logger import logger
+from ..core.config import get_settings
+
+settings = get_settings()
+
+
+# Tamanho máximo da fila de envio de cada conexão
+SEND_QUEUE_SIZE = 256
+
+# Nível do loguru usado ao replicar cada nível de log WebSocket no console
+_LOG_LEVELS = {
+    "info": "INFO",
+    "success": "SUCCESS",
+    "warning": "WARNING",
+    "error": "ERROR"
+}
+
+# Item das filas de envio: (tipo da mensagem, JSON já serializado)
+_Frame = Tuple[Optional[str], str]
+
+_cached_timestamp: Optional[str] = None
+
+
+def _clear_timestamp():
+    global _cached_timestamp
+    _cached_timestamp = None
+
+
+def _timestamp() -> str:
+    """
+    Timestamp ISO compartilhado pelas mensagens do mesmo tick do event loop.
+    
+    Rajadas de send_* no mesmo tick reutilizam um único
+    datetime.now().isoformat(); o cache é limpo no tick seguinte.
+    """
+    global _cached_timestamp
+    if _cached_timestamp is None:
+        _cached_timestamp = datetime.now().isoformat()
+        asyncio.get_running_loop().call_soon(_clear_timestamp)
+    return _cached_timestamp
+
+
+def _serialize(message: dict) -> _Frame:
+    """
+    Serializa a mensagem uma única vez para todos os destinatários.
+    
+    Envia como texto (não bytes): o frontend faz JSON.parse(event.data).
+    """
+    return message.get("type"), orjson.dumps(message).decode()
+
+
+def _enqueue(queue: asyncio.Queue, frame: _Frame):
+    """
+    Enfileira mensagem sem bloquear o produtor.
+    
+    Com a fila cheia (cliente lento), descarta os frames de progresso
+    antigos — só o mais recente importa — preservando logs e conclusão.
+    Se ainda assim não houver espaço, descarta a mensagem mais antiga.
+    """
+    try:
+        queue.put_nowait(frame)
+        return
+    except asyncio.QueueFull:
+        pass
+    
+    pending = []
+    while not queue.empty():
+        pending.append(queue.get_nowait())
+    
+    kept = [f for f in pending if f[0] != "progress"]
+    if len(kept) >= queue.maxsize:
+        kept = kept[len(kept) - queue.maxsize + 1:]
+    
+    for f in kept:
+        queue.put_nowait(f)
+    queue.put_nowait(frame)
+    
+    logger.debug(f"⚠️ Fila WebSocket cheia: {len(pending) - len(kept)} mensagem(ns) descartada(s)")
 
 
 class ConnectionManager:
     """Gerencia conexões WebSocket para progresso em tempo real."""
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: set[WebSocket] = set()
+        self._queues: Dict[WebSocket, asyncio.Queue] = {}
+        self._writers: Dict[WebSocket, asyncio.Task] = {}
     
     async def connect(self, websocket: WebSocket):
         """Aceita nova conexão WebSocket."""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        self._queues[websocket] = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._writers[websocket] = asyncio.create_task(self._writer(websocket))
         
         logger.info(f"🔌 Nova conexão WebSocket. Total: {len(self.active_connections)}")
         
@@ -27,43 +109,58 @@ class ConnectionManager:
         await self.send_message(websocket, {
             "type": "connection",
             "status": "connected",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": _timestamp()
         })
     
     def disconnect(self, websocket: WebSocket):
         """Remove conexão WebSocket."""
+        self._queues.pop(websocket, None)
+        
+        writer = self._writers.pop(websocket, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+        
         if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+            self.active_connections.discard(websocket)
             logger.info(f"🔌 Conexão WebSocket removida. Total: {len(self.active_connections)}")
     
+    async def _writer(self, websocket: WebSocket):
+        """Drena a fila da conexão, enviando as mensagens em ordem."""
+        queue = self._queues[websocket]
+        
+        while True:
+            _, payload = await queue.get()
+            try:
+                await websocket.send_text(payload)
+            except Exception as e:
+                logger.warning(f"⚠️ Erro ao enviar mensagem: {e}")
+                self.disconnect(websocket)
+                return
+    
     async def send_message(self, websocket: WebSocket, message: dict):
-        """Envia mensagem para um cliente específico."""
-        try:
-            await websocket.send_json(message)
-        except Exception as e:
-            logger.warning(f"⚠️ Erro ao enviar mensagem: {e}")
-            self.disconnect(websocket)
+        """Enfileira mensagem para um cliente específico."""
+        queue = self._queues.get(websocket)
+        if queue is not None:
+            _enqueue(queue, _serialize(message))
     
     async def broadcast(self, message: dict):
-        """Envia mensagem para todos os clientes conectados."""
+        """
+        Envia mensagem para todos os clientes conectados.
+        
+        Serializa uma vez e apenas enfileira o payload na fila de cada
+        conexão: um cliente lento nunca bloqueia o produtor nem os demais.
+        """
         if not self.active_connections:
             logger.warning("⚠️ Nenhuma conexão WebSocket ativa para broadcast")
             return
         
-        logger.debug(f"📡 Broadcasting para {len(self.active_connections)} cliente(s): {message.get('type', 'unknown')}")
+        logger.debug("📡 Broadcasting para {} cliente(s): {}", len(self.active_connections), message.get("type", "unknown"))
         
-        disconnected = []
+        frame = _serialize(message)
         
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                logger.warning(f"⚠️ Erro ao broadcast: {e}")
-                disconnected.append(connection)
-        
-        # Remove conexões mortas
-        for conn in disconnected:
-            self.disconnect(conn)
+        # Cópia: writers podem desconectar clientes durante a iteração
+        for connection in list(self.active_connections):
+            _enqueue(self._queues[connection], frame)
     
     async def send_progress(self, progress: dict):
         """
@@ -81,13 +178,16 @@ class ConnectionManager:
         """
         message = {
             "type": "progress",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
             **progress
         }
         
         logger.debug(
-            f"📊 Progresso: {progress.get('current_step', 0)}/{progress.get('total_steps', 0)} "
-            f"({progress.get('percentage', 0)}%) - {progress.get('message', '')}"
+            "📊 Progresso: {}/{} ({}%) - {}",
+            progress.get("current_step", 0),
+            progress.get("total_steps", 0),
+            progress.get("percentage", 0),
+            progress.get("message", "")
         )
         
         await self.broadcast(message)
@@ -106,23 +206,50 @@ class ConnectionManager:
         """
         message = {
             "type": "log",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
             **log_entry
         }
         
         # Log no console também
-        level_map = {
-            "info": logger.info,
-            "success": logger.success,
-            "warning": logger.warning,
-            "error": logger.error
+        self._mirror_log(log_entry)
+        
+        await self.broadcast(message)
+    
+    async def send_log_batch(self, entries: List[dict]):
+        """
+        Envia várias entradas de log em um único frame.
+        
+        Args:
+            entries: Lista de entradas no mesmo formato de send_log
+        """
+        if not entries:
+            return
+        
+        message = {
+            "type": "log_batch",
+            "timestamp": _timestamp(),
+            "entries": entries
         }
         
-        log_func = level_map.get(log_entry.get("level", "info"), logger.info)
-        log_func(f"📨 WS Log: {log_entry.get('message', '')}")
+        for log_entry in entries:
+            self._mirror_log(log_entry)
         
         await self.broadcast(message)
     
+    def _mirror_log(self, log_entry: dict):
+        """
+        Replica a entrada de log no console do servidor.
+        
+        Em produção, entradas "info" não são replicadas. A mensagem é
+        passada como argumento: o loguru só a formata se o nível estiver
+        habilitado em algum handler.
+        """
+        level = log_entry.get("level", "info")
+        if level == "info" and not settings.debug:
+            return
+        
+        logger.log(_LOG_LEVELS.get(level, "INFO"), "📨 WS Log: {}", log_entry.get("message", ""))
+    
     async def send_completion(self, result: dict):
         """
         Envia notificação de conclusão.
@@ -138,7 +265,7 @@ class ConnectionManager:
         """
         message = {
             "type": "completion",
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": _timestamp(),
             **result
         }
         
@@ -149,5 +276,65 @@ class ConnectionManager:
         await self.broadcast(message)
 
 
+class LogBatcher:
+    """
+    Agrupa entradas de log e as envia como frames "log_batch".
+    
+    push() apenas acumula (não é async); uma task de fundo envia o buffer
+    a cada `interval` segundos ou assim que ele atinge `max_entries`.
+    Chame flush() antes de mensagens que devem chegar depois dos logs
+    (ex: conclusão) e close() ao final.
+    """
+    
+    def __init__(self, manager: "ConnectionManager", interval: float = 0.05, max_entries: int = 32):
+        self.manager = manager
+        self.interval = interval
+        self.max_entries = max_entries
+        self._buffer: List[dict] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Inicia a task de envio periódico."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._flusher())
+    
+    def push(self, log_entry: dict):
+        """Adiciona entrada ao buffer."""
+        self._buffer.append(log_entry)
+        if len(self._buffer) >= self.max_entries:
+            self._wakeup.set()
+    
+    async def flush(self):
+        """Envia imediatamente as entradas acumuladas."""
+        if not self._buffer:
+            return
+        
+        entries, self._buffer = self._buffer, []
+        await self.manager.send_log_batch(entries)
+    
+    async def close(self):
+        """Encerra a task de fundo e envia o que restar no buffer."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        
+        await self.flush()
+    
+    async def _flusher(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            
+            self._wakeup.clear()
+            await self.flush()
+
+
 # Instância global
 manager = ConnectionManager()
\ No newline at end of file
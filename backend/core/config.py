@@ -6,9 +6,15 @@ Este módulo gerencia todas as variáveis de ambiente e configurações
 do sistema, com validação automática e suporte a .env file.
 """
 
+from pydantic import PrivateAttr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
-from typing import Optional
+from typing import Any, Optional
+
+
+# Providers suportados (fonte única: factory e rotas importam daqui).
+# A ordem é a usada nas mensagens de erro
+VALID_PROVIDERS = ("openai", "anthropic", "gemini", "deepseek")
 
 
 class Settings(BaseSettings):
@@ -83,6 +89,9 @@ class Settings(BaseSettings):
     max_file_size_mb: int = 10
     """Tamanho máximo de arquivo HTML em MB"""
     
+    job_result_ttl: int = 3600
+    """Tempo (segundos) que o resultado de um job fica disponível em /api/jobs/{id}"""
+    
     # ============================================
     # CONFIGURAÇÃO PYDANTIC
     # ============================================
@@ -93,6 +102,24 @@ class Settings(BaseSettings):
         extra="ignore"
     )
     
+    # Derivados das API keys (imutáveis após a construção)
+    _provider_keys: dict[str, str] = PrivateAttr(default_factory=dict)
+    _configured_providers: list[str] = PrivateAttr(default_factory=list)
+    
+    def model_post_init(self, __context: Any) -> None:
+        """Pré-calcula o mapa de API keys e a lista de providers configurados."""
+        self._provider_keys = {
+            "openai": self.openai_api_key,
+            "anthropic": self.anthropic_api_key,
+            "gemini": self.google_api_key,
+            "google": self.google_api_key,
+            "deepseek": self.deepseek_api_key,
+        }
+        self._configured_providers = [
+            provider for provider in VALID_PROVIDERS
+            if self.is_provider_configured(provider)
+        ]
+    
     # ============================================
     # MÉTODOS AUXILIARES
     # ============================================
@@ -107,17 +134,7 @@ class Settings(BaseSettings):
         Returns:
             API key ou None se não configurada
         """
-        provider = provider.lower()
-        
-        key_mapping = {
-            "openai": self.openai_api_key,
-            "anthropic": self.anthropic_api_key,
-            "gemini": self.google_api_key,
-            "google": self.google_api_key,
-            "deepseek": self.deepseek_api_key,
-        }
-        
-        return key_mapping.get(provider)
+        return self._provider_keys.get(provider.lower())
     
     def is_provider_configured(self, provider: str) -> bool:
         """
@@ -139,21 +156,8 @@ class Settings(BaseSettings):
         Returns:
             Lista de nomes de providers configurados
         """
-        providers = []
-        
-        if self.is_provider_configured("openai"):
-            providers.append("openai")
-        
-        if self.is_provider_configured("anthropic"):
-            providers.append("anthropic")
-        
-        if self.is_provider_configured("gemini"):
-            providers.append("gemini")
-        
-        if self.is_provider_configured("deepseek"):
-            providers.append("deepseek")
-        
-        return providers
+        # Cópia para que o chamador não altere o cache
+        return list(self._configured_providers)
     
     def validate_provider(self, provider: str) -> tuple[bool, str]:
         """
@@ -165,10 +169,8 @@ class Settings(BaseSettings):
         Returns:
             Tuple (is_valid, error_message)
         """
-        valid_providers = ["openai", "anthropic", "gemini", "deepseek"]
-        
-        if provider.lower() not in valid_providers:
-            return False, f"Provider '{provider}' não é válido. Opções: {', '.join(valid_providers)}"
+        if provider.lower() not in VALID_PROVIDERS:
+            return False, f"Provider '{provider}' não é válido. Opções: {', '.join(VALID_PROVIDERS)}"
         
         if not self.is_provider_configured(provider):
             return False, f"Provider '{provider}' não está configurado. Adicione a API key no arquivo .env"
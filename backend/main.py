@@ -6,23 +6,29 @@ Ponto de entrada da aplicação, configura rotas, middleware,
 WebSocket e lifecycle events.
 """
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
+import gzip
+import hashlib
 import uvicorn
 from pathlib import Path
 from .api.routes_parallel import router as parallel_router
 
 from .core.config import get_settings
-from .utils.logger import setup_logger
+from .utils.logger import setup_logger, logger
 from .api.routes import router
 from .api.websocket import manager
 from .services.file_manager import ensure_directories
 
 settings = get_settings()
 
+# Página servida em "/" quando frontend/index.html não existe no startup
+INDEX_NOT_FOUND_HTML = "<h1>Erro: Interface não encontrada</h1><p>Arquivo frontend/index.html não existe.</p>"
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -36,6 +42,21 @@ async def lifespan(app: FastAPI):
     setup_logger(settings)
     ensure_directories()
     
+    # Interface lida uma única vez; root() serve da memória
+    html_path = Path("frontend/index.html")
+    try:
+        app.state.index_html = html_path.read_text(encoding="utf-8")
+        app.state.index_status = 200
+    except FileNotFoundError:
+        logger.error(f"❌ Interface não encontrada: {html_path}")
+        app.state.index_html = INDEX_NOT_FOUND_HTML
+        app.state.index_status = 500
+    
+    html_bytes = app.state.index_html.encode("utf-8")
+    app.state.index_html_gz = gzip.compress(html_bytes, compresslevel=9)
+    # ETag fraca: vale para as versões gzip e sem compressão
+    app.state.index_etag = f'W/"{hashlib.md5(html_bytes, usedforsecurity=False).hexdigest()}"'
+    
     print("\n" + "="*60)
     print(f"🚀 {settings.app_name} v{settings.app_version}")
     print("="*60)
@@ -58,6 +79,7 @@ app = FastAPI(
     version=settings.app_version,
     description="Sistema de geração automática de mapas mentais em Mermaid para conteúdo jurídico",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
 )
@@ -75,6 +97,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Comprime respostas HTTP maiores que 500 bytes (WebSocket não é afetado)
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 
 # ============================================
 # ROTAS DA API
@@ -89,20 +114,28 @@ app.include_router(parallel_router, prefix="/api", tags=["parallel"])
 # ============================================
 
 @app.get("/", response_class=HTMLResponse)
-async def root():
+async def root(request: Request):
     """
     Serve a interface HTML principal.
+    
+    Clientes que aceitam gzip recebem a versão pré-comprimida no startup.
+    Se o If-None-Match bater com a ETag, responde 304 sem corpo.
     """
-    html_path = Path("frontend/index.html")
+    status = app.state.index_status
+    headers = {"ETag": app.state.index_etag, "Vary": "Accept-Encoding"}
     
-    if not html_path.exists():
-        return HTMLResponse(
-            content="<h1>Erro: Interface não encontrada</h1><p>Arquivo frontend/index.html não existe.</p>",
-            status_code=500
+    if status == 200 and request.headers.get("if-none-match") == app.state.index_etag:
+        return Response(status_code=304, headers=headers)
+    
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        return Response(
+            content=app.state.index_html_gz,
+            status_code=status,
+            media_type="text/html",
+            headers={**headers, "Content-Encoding": "gzip"}
         )
     
-    with open(html_path, encoding="utf-8") as f:
-        return HTMLResponse(content=f.read())
+    return HTMLResponse(content=app.state.index_html, status_code=status, headers=headers)
 
 
 # ============================================
@@ -143,12 +176,15 @@ async def health_check():
     Retorna informações sobre a saúde do sistema,
     providers configurados e versão.
     """
-    return JSONResponse({
-        "status": "healthy",
-        "version": settings.app_version,
-        "providers": settings.list_configured_providers(),
-        "debug": settings.debug
-    })
+    return ORJSONResponse(
+        {
+            "status": "healthy",
+            "version": settings.app_version,
+            "providers": settings.list_configured_providers(),
+            "debug": settings.debug
+        },
+        headers={"Cache-Control": "public, max-age=5"}
+    )
 
 
 # ============================================
@@ -174,7 +210,7 @@ async def global_exception_handler(request, exc):
     
     logger.error(f"Erro não tratado: {exc}")
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -1,38 +1,82 @@
 # backend/services/file_manager.py
 import os
+import re
+import asyncio
 from pathlib import Path
 from datetime import datetime
-import json
+from functools import lru_cache
+from typing import Optional
+import aiofiles
+import orjson
 from ..core.config import get_settings
 
 settings = get_settings()
 
+# Tamanho dos blocos lidos do upload ao gravar em disco
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Tudo que não é alfanumérico (Unicode), '_', '-' ou '.'
+_UNSAFE_FILENAME_RE = re.compile(r'[^\w.-]')
+
+@lru_cache(maxsize=1)
 def ensure_directories():
-    """Garante que os diretórios necessários existem."""
+    """
+    Garante que os diretórios necessários existem.
+    
+    Executa apenas uma vez por processo: os diretórios não somem em
+    tempo de execução, então as chamadas seguintes não fazem syscalls.
+    """
     Path(settings.upload_dir).mkdir(parents=True, exist_ok=True)
     Path(settings.output_dir).mkdir(parents=True, exist_ok=True)
     Path(settings.logs_dir).mkdir(parents=True, exist_ok=True)
 
-def save_uploaded_html(file_content: bytes, filename: str) -> str:
+def _safe_filename(filename: str) -> str:
+    """Sanitiza nome do arquivo."""
+    return _UNSAFE_FILENAME_RE.sub('', filename)
+
+async def save_upload_stream(upload) -> Optional[str]:
     """
-    Salva HTML enviado pelo usuário.
+    Grava um UploadFile .html em disco, em blocos, sem carregá-lo inteiro.
+    
+    Args:
+        upload: UploadFile recebido pela rota
     
     Returns:
-        str: Caminho completo do arquivo salvo
+        str ou None: Nome original do arquivo, ou None se não for .html
     """
+    if not upload.filename.endswith('.html'):
+        return None
+    
     ensure_directories()
     
-    # Sanitiza nome do arquivo
-    safe_filename = "".join(c for c in filename if c.isalnum() or c in ('_', '-', '.'))
+    filepath = Path(settings.upload_dir) / _safe_filename(upload.filename)
     
-    filepath = Path(settings.upload_dir) / safe_filename
+    async with aiofiles.open(filepath, 'wb') as out:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            await out.write(chunk)
     
-    with open(filepath, 'wb') as f:
-        f.write(file_content)
+    return upload.filename
+
+async def save_uploaded_htmls(uploads: list) -> list[str]:
+    """
+    Grava concorrentemente todos os uploads .html de uma requisição.
     
-    return str(filepath)
+    Uploads que caem no mesmo caminho sanitizado são gravados uma única vez,
+    com o último deles (o mesmo resultado da gravação sequencial), para que
+    duas escritas concorrentes não corrompam o arquivo.
+    
+    Returns:
+        list: Nomes dos arquivos salvos, na ordem do upload
+    """
+    html_uploads = [f for f in uploads if f.filename.endswith('.html')]
+    
+    # Em nomes repetidos o último upload sobrescreve os anteriores no dict
+    by_path = {_safe_filename(f.filename): f for f in html_uploads}
+    
+    await asyncio.gather(*(save_upload_stream(f) for f in by_path.values()))
+    return [f.filename for f in html_uploads]
 
-def save_mmd_file(filename: str, content: str, metadata: dict = None) -> str:
+async def save_mmd_file(filename: str, content: str, metadata: dict = None) -> str:
     """
     Salva arquivo .mmd no diretório de output.
     
@@ -49,16 +93,17 @@ def save_mmd_file(filename: str, content: str, metadata: dict = None) -> str:
     filepath = Path(settings.output_dir) / filename
     
     # Salva o arquivo .mmd
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(content)
+    async with aiofiles.open(filepath, 'w', encoding='utf-8') as f:
+        await f.write(content)
     
     # Salva metadados se fornecidos
     if metadata:
         meta_filename = filename.replace('.mmd', '.meta.json')
         meta_filepath = Path(settings.output_dir) / meta_filename
         
-        with open(meta_filepath, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        # orjson grava UTF-8 direto (mesmo efeito de ensure_ascii=False)
+        async with aiofiles.open(meta_filepath, 'wb') as f:
+            await f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2))
     
     return str(filepath)
 
@@ -85,16 +130,16 @@ def cleanup_old_files(max_age_days: int = 7):
     """
     from datetime import timedelta
     
-    cutoff = datetime.now() - timedelta(days=max_age_days)
+    # Timestamp calculado uma vez: comparação direta com st_mtime
+    cutoff_ts = (datetime.now() - timedelta(days=max_age_days)).timestamp()
     
     for directory in [settings.upload_dir, settings.output_dir]:
-        path = Path(directory)
-        if not path.exists():
+        if not os.path.isdir(directory):
             continue
         
-        for file in path.iterdir():
-            if file.is_file():
-                file_time = datetime.fromtimestamp(file.stat().st_mtime)
-                if file_time < cutoff:
-                    file.unlink()
-                    print(f"Removido arquivo antigo: {file}")
\ No newline at end of file
+        # DirEntry reaproveita as informações da leitura do diretório
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.stat().st_mtime < cutoff_ts:
+                    os.unlink(entry.path)
+                    print(f"Removido arquivo antigo: {entry.path}")
\ No newline at end of file
@@ -6,18 +6,70 @@ Fornece funções utilitárias para extrair informações
 de arquivos HTML formatados conforme padrão esperado.
 """
 
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from lxml import html as lxml_html
+from lxml.html import HtmlElement
 from pathlib import Path
+import os
 import re
 from typing import Dict, Optional
 from ..utils.logger import logger
 
 
+# Padrão principal do título: [RAMO] - [TÓPICO] - ...
+_TITLE_BRACKET_RE = re.compile(r'^\[(.+?)\]\s*-\s*\[(.+?)\]\s*-')
+
+# Padrão alternativo do título: RAMO - TÓPICO - ...
+_TITLE_PLAIN_RE = re.compile(r'^(.+?)\s*-\s*(.+?)\s*-')
+
+_MULTI_NL_RE = re.compile(r'\n{3,}')
+_MULTI_SPACE_RE = re.compile(r' {2,}')
+
+
+# Os arquivos são UTF-8; parse a partir de bytes aceita também HTML com
+# declaração <?xml ... encoding=...?> (rejeitada pelo lxml em str)
+_UTF8_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+# Elementos cujo conteúdo não entra no texto extraído
+_NON_TEXT_TAGS = ('script', 'style', 'template')
+
+
 class HTMLParseError(Exception):
     """Exceção customizada para erros de parsing."""
     pass
 
 
+class _TitleFound(Exception):
+    """Interrompe o scan assim que o </title> é encontrado."""
+    pass
+
+
+class _TitleScanner(HTMLParser):
+    """
+    Scanner incremental que captura apenas o texto do <title>.
+    
+    Não monta árvore: ao fechar o <title> lança _TitleFound com o texto.
+    """
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._in_title = False
+        self._buffer: list[str] = []
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == 'title':
+            self._in_title = True
+    
+    def handle_data(self, data):
+        if self._in_title:
+            self._buffer.append(data)
+    
+    def handle_endtag(self, tag):
+        if tag == 'title' and self._in_title:
+            raise _TitleFound(''.join(self._buffer))
+
+
 def parse_html_file(filepath: Path) -> Dict[str, str]:
     """
     Faz parsing de um arquivo HTML e extrai informações estruturadas.
@@ -43,16 +95,15 @@ def parse_html_file(filepath: Path) -> Dict[str, str]:
     
     try:
         # Lê o arquivo
-        with open(filepath, 'r', encoding='utf-8') as f:
-            html_content = f.read()
+        html_content = filepath.read_bytes()
         
-        # Parse com BeautifulSoup
-        soup = BeautifulSoup(html_content, 'lxml')
+        # Parse direto com lxml (sem a camada de objetos do BeautifulSoup)
+        tree = lxml_html.document_fromstring(html_content, parser=_UTF8_PARSER)
         
         # Extrai dados
-        title = extract_title(soup)
+        title = extract_title(tree)
         ramo_direito, topico = parse_title_pattern(title)
-        fundamentacao = extract_fundamentacao(soup)
+        fundamentacao = extract_fundamentacao(tree)
         
         return {
             "ramo_direito": ramo_direito,
@@ -67,12 +118,38 @@ def parse_html_file(filepath: Path) -> Dict[str, str]:
         raise HTMLParseError(f"Erro ao processar HTML: {str(e)}")
 
 
-def extract_title(soup: BeautifulSoup) -> str:
+def parse_html_files(filepaths: list[Path]) -> list[Dict[str, str]]:
+    """
+    Faz parsing de vários arquivos HTML em paralelo (um processo por núcleo).
+    
+    O parsing é CPU-bound e não compartilha estado, então escala com
+    processos. Para um único arquivo evita o custo de criar o pool.
+    
+    Args:
+        filepaths: Caminhos dos arquivos HTML
+    
+    Returns:
+        list: Resultados de parse_html_file, na mesma ordem de entrada
+    
+    Raises:
+        HTMLParseError: Se algum arquivo falhar no parsing
+        FileNotFoundError: Se algum arquivo não existir
+    """
+    if len(filepaths) <= 1:
+        return [parse_html_file(path) for path in filepaths]
+    
+    max_workers = min(len(filepaths), os.cpu_count() or 1)
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(parse_html_file, filepaths, chunksize=1))
+
+
+def extract_title(tree: HtmlElement) -> str:
     """
     Extrai o título do HTML.
     
     Args:
-        soup: Objeto BeautifulSoup
+        tree: Documento HTML parseado pelo lxml
     
     Returns:
         str: Texto do título
@@ -80,12 +157,12 @@ def extract_title(soup: BeautifulSoup) -> str:
     Raises:
         HTMLParseError: Se título não for encontrado
     """
-    title_tag = soup.find('title')
+    title_tag = tree.find('.//title')
     
-    if not title_tag:
+    if title_tag is None:
         raise HTMLParseError("Tag <title> não encontrada no HTML")
     
-    title = title_tag.get_text(strip=True)
+    title = title_tag.text_content().strip()
     
     if not title:
         raise HTMLParseError("Tag <title> está vazia")
@@ -110,15 +187,13 @@ def parse_title_pattern(title: str) -> tuple[str, str]:
     """
     
     # Padrão principal: com colchetes
-    pattern = r'^\[(.+?)\]\s*-\s*\[(.+?)\]\s*-'
-    match = re.match(pattern, title)
+    match = _TITLE_BRACKET_RE.match(title)
     
     if match:
         return match.group(1).strip(), match.group(2).strip()
     
     # Padrão alternativo: sem colchetes
-    pattern_alt = r'^(.+?)\s*-\s*(.+?)\s*-'
-    match = re.match(pattern_alt, title)
+    match = _TITLE_PLAIN_RE.match(title)
     
     if match:
         logger.warning("⚠️ Título sem colchetes, usando padrão alternativo")
@@ -131,12 +206,12 @@ def parse_title_pattern(title: str) -> tuple[str, str]:
     )
 
 
-def extract_fundamentacao(soup: BeautifulSoup) -> str:
+def extract_fundamentacao(tree: HtmlElement) -> str:
     """
     Extrai o conteúdo da fundamentação teórica.
     
     Args:
-        soup: Objeto BeautifulSoup
+        tree: Documento HTML parseado pelo lxml
     
     Returns:
         str: Texto da fundamentação
@@ -145,16 +220,27 @@ def extract_fundamentacao(soup: BeautifulSoup) -> str:
         HTMLParseError: Se section não for encontrada ou estiver vazia
     """
     
-    fundamentacao_section = soup.find('section', id='fundamentacao')
+    sections = tree.xpath('//section[@id="fundamentacao"]')
     
-    if not fundamentacao_section:
+    if not sections:
         raise HTMLParseError(
             "Section com id='fundamentacao' não encontrada.\n"
             "Certifique-se de que existe: <section id=\"fundamentacao\">...</section>"
         )
     
-    # Extrai texto
-    fundamentacao = fundamentacao_section.get_text(separator='\n', strip=True)
+    # <script>/<style>/<template> não são texto (o get_text do BeautifulSoup os
+    # ignora). Zera o conteúdo na árvore (descartável) sem remover os elementos,
+    # para o texto antes e depois deles continuar em trechos separados
+    section = sections[0]
+    for skipped in section.iter(*_NON_TEXT_TAGS):
+        for node in skipped.iter():
+            node.text = None
+            if node is not skipped:
+                node.tail = None
+    
+    # Extrai texto: um trecho não vazio por linha (como get_text(separator='\n', strip=True))
+    pieces = (text.strip() for text in section.itertext())
+    fundamentacao = '\n'.join(piece for piece in pieces if piece)
     
     if not fundamentacao or len(fundamentacao) < 100:
         raise HTMLParseError(
@@ -179,10 +265,10 @@ def normalize_text(text: str) -> str:
     """
     
     # Remove linhas vazias extras
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _MULTI_NL_RE.sub('\n\n', text)
     
     # Remove espaços múltiplos
-    text = re.sub(r' {2,}', ' ', text)
+    text = _MULTI_SPACE_RE.sub(' ', text)
     
     # Remove espaços no início/fim de linhas
     lines = [line.strip() for line in text.split('\n')]
@@ -227,18 +313,20 @@ def extract_metadata(filepath: Path) -> Optional[Dict]:
     """
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
+        with open(filepath, 'rb') as f:
+            size_bytes = os.fstat(f.fileno()).st_size
             # Lê apenas os primeiros 2KB (suficiente para <head>)
-            content = f.read(2048)
-        
-        soup = BeautifulSoup(content, 'lxml')
+            content = f.read(2048).decode('utf-8', errors='ignore')
         
-        title = soup.find('title')
-        if not title:
+        # Scan sem árvore: para no </title>
+        scanner = _TitleScanner()
+        try:
+            scanner.feed(content)
+        except _TitleFound as found:
+            title_text = found.args[0].strip()
+        else:
             return None
         
-        title_text = title.get_text(strip=True)
-        
         try:
             ramo, topico = parse_title_pattern(title_text)
         except HTMLParseError:
@@ -248,7 +336,7 @@ def extract_metadata(filepath: Path) -> Optional[Dict]:
             "filename": filepath.name,
             "ramo_direito": ramo,
             "topico": topico,
-            "size_bytes": filepath.stat().st_size
+            "size_bytes": size_bytes
         }
     
     except Exception:
@@ -0,0 +1,110 @@
+# backend/services/job_store.py
+"""
+Registro em memória dos jobs de processamento.
+
+As rotas de processamento respondem 202 imediatamente e executam o
+pipeline em background. Este módulo guarda o status e o resultado final
+de cada job (com TTL) para consulta via GET /api/jobs/{job_id}.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Coroutine, Dict, Optional
+from uuid import uuid4
+
+from ..core.config import get_settings
+
+settings = get_settings()
+
+_jobs: Dict[str, dict] = {}
+_tasks: set[asyncio.Task] = set()
+
+
+def _purge_expired():
+    """Remove jobs finalizados cujo TTL já expirou."""
+    now = time.monotonic()
+    expired = [
+        job_id for job_id, job in _jobs.items()
+        if job["_expires_at"] is not None and job["_expires_at"] <= now
+    ]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def create_job(mode: str, files: list[str]) -> str:
+    """
+    Registra um novo job em execução.
+
+    Args:
+        mode: Modo de processamento (sequential, parallel)
+        files: Arquivos HTML do job
+
+    Returns:
+        str: Identificador do job
+    """
+    _purge_expired()
+
+    job_id = uuid4().hex
+    _jobs[job_id] = {
+        "job_id": job_id,
+        "mode": mode,
+        "status": "running",
+        "files": files,
+        "created_at": datetime.now().isoformat(),
+        "finished_at": None,
+        "result": None,
+        "error": None,
+        "_expires_at": None
+    }
+
+    return job_id
+
+
+def _finish(job_id: str, **fields):
+    job = _jobs.get(job_id)
+    if job is None:
+        return
+
+    job.update(fields)
+    job["finished_at"] = datetime.now().isoformat()
+    job["_expires_at"] = time.monotonic() + settings.job_result_ttl
+
+
+def complete_job(job_id: str, result: dict):
+    """Marca o job como concluído e guarda o resultado final."""
+    _finish(job_id, status="completed", result=result)
+
+
+def fail_job(job_id: str, error: str):
+    """Marca o job como falho."""
+    _finish(job_id, status="error", error=error)
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    """
+    Retorna o status público de um job.
+
+    Returns:
+        dict ou None: Dados do job ou None se inexistente/expirado
+    """
+    _purge_expired()
+
+    job = _jobs.get(job_id)
+    if job is None:
+        return None
+
+    return {k: v for k, v in job.items() if not k.startswith("_")}
+
+
+def spawn_job(coro: Coroutine) -> asyncio.Task:
+    """
+    Agenda a execução do job em background.
+
+    Mantém referência forte à task até o fim, evitando que seja
+    coletada pelo GC enquanto ainda está rodando.
+    """
+    task = asyncio.create_task(coro)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return task
@@ -11,12 +11,15 @@ from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_deepseek import ChatDeepSeek
+from functools import lru_cache
 from typing import Optional
 import os
 
-from ..core.config import get_settings
+from ..core.config import VALID_PROVIDERS, get_settings
 from ..utils.logger import logger
 
+settings = get_settings()
+
 
 # ============================================
 # MAPEAMENTO DE MODELOS PADRÃO
@@ -29,6 +32,60 @@ DEFAULT_MODELS = {
     "deepseek": "deepseek-reasoner"
 }
 
+# Todo provider aceito pela configuração precisa de um modelo padrão
+assert set(DEFAULT_MODELS) == set(VALID_PROVIDERS), "DEFAULT_MODELS fora de sincronia com VALID_PROVIDERS"
+
+
+# ============================================
+# TABELA DE DESPACHO POR PROVIDER
+# ============================================
+
+# provider -> (classe LangChain, atributo da API key no Settings, kwarg da key)
+_PROVIDER_TABLE = {
+    "openai": (ChatOpenAI, "openai_api_key", "api_key"),
+    "anthropic": (ChatAnthropic, "anthropic_api_key", "api_key"),
+    "gemini": (ChatGoogleGenerativeAI, "google_api_key", "google_api_key"),
+    "deepseek": (ChatDeepSeek, "deepseek_api_key", "api_key"),
+}
+
+# Providers que já passaram pela validação (Settings não muda após o startup)
+_VALIDATED: set[str] = set()
+
+
+# ============================================
+# CONSTRUÇÃO COM CACHE
+# ============================================
+
+@lru_cache(maxsize=32)
+def _build_llm(
+    provider: str,
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    kwargs_key: tuple
+):
+    """
+    Instancia o ChatModel do provider.
+    
+    Cacheado por configuração: chamadas repetidas reaproveitam a mesma
+    instância (e o pool de conexões HTTP do cliente).
+    """
+    logger.debug(
+        f"Criando LLM: provider={provider}, model={model}, "
+        f"temp={temperature}, max_tokens={max_tokens}"
+    )
+    
+    cls, key_attr, key_kwarg = _PROVIDER_TABLE[provider]
+    
+    return cls(
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        timeout=settings.llm_timeout,
+        **{key_kwarg: getattr(settings, key_attr)},
+        **dict(kwargs_key)
+    )
+
 
 # ============================================
 # FUNÇÃO PRINCIPAL - FACTORY
@@ -56,7 +113,8 @@ def get_llm(
         **kwargs: Argumentos adicionais específicos do provider
     
     Returns:
-        ChatModel: Instância do modelo configurado
+        ChatModel: Instância do modelo configurado (compartilhada entre
+        chamadas com a mesma configuração)
     
     Raises:
         ValueError: Se provider for inválido ou não configurado
@@ -69,94 +127,46 @@ def get_llm(
         >>> response = await llm.ainvoke([{"role": "user", "content": "Hi"}])
     """
     
-    settings = get_settings()
     provider = provider.lower()
     
-    # Valida provider
-    valid_providers = ["openai", "anthropic", "gemini", "deepseek"]
-    if provider not in valid_providers:
-        raise ValueError(
-            f"Provider '{provider}' não é válido. "
-            f"Opções: {', '.join(valid_providers)}"
-        )
-    
-    # Verifica se provider está configurado
-    if not settings.is_provider_configured(provider):
-        configured = settings.list_configured_providers()
-        raise ValueError(
-            f"Provider '{provider}' não está configurado no .env\n"
-            f"Providers configurados: {', '.join(configured) if configured else 'nenhum'}\n"
-            f"Adicione a API key correspondente no arquivo .env"
-        )
+    if provider not in _VALIDATED:
+        # Valida provider
+        if provider not in VALID_PROVIDERS:
+            raise ValueError(
+                f"Provider '{provider}' não é válido. "
+                f"Opções: {', '.join(VALID_PROVIDERS)}"
+            )
+        
+        # Verifica se provider está configurado
+        if not settings.is_provider_configured(provider):
+            configured = settings.list_configured_providers()
+            raise ValueError(
+                f"Provider '{provider}' não está configurado no .env\n"
+                f"Providers configurados: {', '.join(configured) if configured else 'nenhum'}\n"
+                f"Adicione a API key correspondente no arquivo .env"
+            )
     
     # Usa modelo padrão se não especificado
     if model is None:
         model = DEFAULT_MODELS[provider]
     
-    logger.debug(
-        f"Criando LLM: provider={provider}, model={model}, "
-        f"temp={temperature}, max_tokens={max_tokens}"
-    )
-    
-    # ============================================
-    # OPENAI
-    # ============================================
-    
-    if provider == "openai":
-        return ChatOpenAI(
-            model=model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            api_key=settings.openai_api_key,
-            timeout=settings.llm_timeout,
-            **kwargs
-        )
+    # kwargs congelados para compor a chave do cache
+    kwargs_key = tuple(sorted(kwargs.items()))
     
-    # ============================================
-    # ANTHROPIC
-    # ============================================
-    
-    elif provider == "anthropic":
-        return ChatAnthropic(
-            model=model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            api_key=settings.anthropic_api_key,
-            timeout=settings.llm_timeout,
-            **kwargs
+    try:
+        hash(kwargs_key)
+    except TypeError:
+        logger.warning(
+            f"⚠️ kwargs não hasheáveis para {provider}; criando LLM sem cache"
         )
+        llm = _build_llm.__wrapped__(provider, model, temperature, max_tokens, kwargs_key)
+    else:
+        llm = _build_llm(provider, model, temperature, max_tokens, kwargs_key)
     
-    # ============================================
-    # GOOGLE GEMINI
-    # ============================================
-    
-    elif provider == "gemini":
-        return ChatGoogleGenerativeAI(
-            model=model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            google_api_key=settings.google_api_key,
-            timeout=settings.llm_timeout,
-            **kwargs
-        )
+    # Só marca como validado depois de construir com sucesso
+    _VALIDATED.add(provider)
     
-    # ============================================
-    # DEEPSEEK
-    # ============================================
-    
-    elif provider == "deepseek":
-        return ChatDeepSeek(
-            model=model,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            api_key=settings.deepseek_api_key,
-            timeout=settings.llm_timeout,
-            **kwargs
-        )
-    
-    else:
-        # Não deve chegar aqui devido à validação anterior
-        raise ValueError(f"Provider não implementado: {provider}")
+    return llm
 
 
 # ============================================
@@ -170,7 +180,6 @@ def list_available_providers() -> list[str]:
     Returns:
         list: Lista de nomes de providers configurados
     """
-    settings = get_settings()
     return settings.list_configured_providers()
 
 
@@ -189,10 +198,10 @@ def get_default_model(provider: str) -> str:
     """
     provider = provider.lower()
     
-    if provider not in DEFAULT_MODELS:
+    if provider not in VALID_PROVIDERS:
         raise ValueError(
             f"Provider '{provider}' não existe. "
-            f"Opções: {', '.join(DEFAULT_MODELS.keys())}"
+            f"Opções: {', '.join(VALID_PROVIDERS)}"
         )
     
     return DEFAULT_MODELS[provider]
@@ -208,7 +217,6 @@ def validate_provider_config(provider: str) -> tuple[bool, str]:
     Returns:
         tuple: (is_valid, error_message)
     """
-    settings = get_settings()
     return settings.validate_provider(provider)
 
 
@@ -222,10 +230,9 @@ def get_provider_info(provider: str) -> dict:
     Returns:
         dict: Informações do provider
     """
-    settings = get_settings()
     provider = provider.lower()
     
-    if provider not in DEFAULT_MODELS:
+    if provider not in VALID_PROVIDERS:
         return {
             "provider": provider,
             "exists": False,
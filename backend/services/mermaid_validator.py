@@ -1,66 +1,213 @@
 # backend/services/mermaid_validator.py
 import re
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Tuple, List
+from typing import Final, Iterator, List, Pattern, Tuple
+
+# Constantes anotadas com Final: o módulo pode ser compilado com mypyc
+# (mypyc backend/services/mermaid_validator.py) sem mudar a API; sem a
+# extensão compilada, o .py continua sendo importado normalmente.
+
+# Padrões compilados uma única vez (evita o lookup no cache interno do re)
+_RE_ROOT: Final[Pattern[str]] = re.compile(r'\{\{?\*\*.*?\*\*\}\}?')
+_RE_FENCE_OPEN: Final[Pattern[str]] = re.compile(r'^```mermaid\s*', re.MULTILINE)
+_RE_FENCE_CLOSE: Final[Pattern[str]] = re.compile(r'\s*```$', re.MULTILINE)
+_RE_ICON_SPACES: Final[Pattern[str]] = re.compile(r'::icon\s*\(\s*fa\s+fa-')
+
+# Qualquer trecho que fix_common_issues alteraria: '\r', cercas de código,
+# espaço no fim de linha, 3+ quebras, ícone fora da forma canônica ou
+# parênteses/colchetes em linha que não é de ícone
+_RE_NEEDS_FIX: Final[Pattern[str]] = re.compile(
+    r'\r|```|[^\S\n]\n|\n\n\n'
+    r'|::icon(?!\(fa fa-)\s*\(\s*fa\s+fa-'
+    r'|^(?![^\S\n]*::icon\()[^\n]*[()\[\]]',
+    re.MULTILINE
+)
+
+# Caracteres que quebram o parser do Mermaid
+_PROBLEM_CHARS: Final[str] = '`~^&<>'
+
+# Mensagens de erro (formatadas com %, só quando o erro é de fato consumido)
+_MSG_NO_HEADER: Final[str] = "Arquivo deve começar com 'mindmap'"
+_MSG_NO_ROOT: Final[str] = "Falta título raiz no formato {{**Título**}}"
+_MSG_PROBLEM_CHAR: Final[str] = "Caractere problemático encontrado: '%s'"
+_MSG_INDENT_BAD: Final[str] = "Linha %d: Indentação inválida (deve ser múltiplo de 2)"
+_MSG_BRACKETS: Final[str] = "Linha %d: Parênteses ou colchetes não permitidos. Encontrado: '%s'"
+_MSG_BRACES: Final[str] = "Chaves desbalanceadas: %d abertas e %d fechadas"
 
 class MermaidValidator:
-    """Validador e corretor de sintaxe Mermaid para mindmaps."""
+    """
+    Validador e corretor de sintaxe Mermaid para mindmaps.
+    
+    Os resultados são cacheados por conteúdo (LRU): revalidar ou recorrigir
+    o mesmo texto em retries é O(1). Use cache_clear() para esvaziar.
+    """
     
     @staticmethod
-    def validate_mindmap(content: str) -> Tuple[bool, List[str]]:
+    def _iter_errors(content: str) -> Iterator[str]:
         """
-        Valida a sintaxe de um mindmap Mermaid, incluindo a regra de não usar parênteses/colchetes.
+        Gera os erros de sintaxe do mindmap, sob demanda e em ordem.
+        
+        Regras: cabeçalho 'mindmap', título raiz, caracteres problemáticos,
+        indentação em múltiplos de 2, parênteses/colchetes nos nós e
+        chaves balanceadas. As checagens mais baratas vêm primeiro; quem só
+        precisa do primeiro erro não paga pelas demais nem pela formatação.
         """
-        errors = []
-        lines = content.split('\n')
-
         if not content.strip().startswith('mindmap'):
-            errors.append("Arquivo deve começar com 'mindmap'")
+            yield _MSG_NO_HEADER
         
-        if not re.search(r'\{\{?\*\*.*?\*\*\}\}?', content):
-            errors.append("Falta título raiz no formato {{**Título**}}")
+        # Busca de substring (C) antes do regex: sem '{**' e '**}' não há título
+        has_root = '{**' in content and '**}' in content and _RE_ROOT.search(content)
+        if not has_root:
+            yield _MSG_NO_ROOT
         
-        for i, line in enumerate(lines, start=1):
-            stripped_line = line.strip()
-            if not stripped_line or stripped_line.startswith('::icon(') or stripped_line == 'mindmap':
+        # Busca de substring por caractere (memchr em C), rápida mesmo com acentos
+        for char in _PROBLEM_CHARS:
+            if char in content:
+                yield _MSG_PROBLEM_CHAR % char
+        
+        # Chaves contadas no mesmo loop das linhas (sem passada extra no conteúdo)
+        open_braces = 0
+        close_braces = 0
+        
+        # Passada única; split('\n') mantém a numeração de linhas do Mermaid
+        for i, line in enumerate(content.split('\n'), start=1):
+            if not line or line.isspace():
+                continue
+            
+            indent = len(line) - len(line.lstrip(' '))
+            if indent % 2 != 0:
+                yield _MSG_INDENT_BAD % i
+            
+            if '{' in line or '}' in line:
+                open_braces += line.count('{')
+                close_braces += line.count('}')
+            
+            # Linhas sem parênteses/colchetes não precisam de strip
+            if not ('(' in line or ')' in line or '[' in line or ']' in line):
                 continue
 
-            if '(' in stripped_line or ')' in stripped_line or '[' in stripped_line or ']' in stripped_line:
-                if not stripped_line.startswith('{'):
-                    errors.append(f"Linha {i}: Parênteses ou colchetes não permitidos. Encontrado: '{stripped_line}'")
+            stripped_line = line.strip()
+            if stripped_line.startswith(('::icon(', '{')):
+                continue
 
+            yield _MSG_BRACKETS % (i, stripped_line)
+        
+        if open_braces != close_braces:
+            yield _MSG_BRACES % (open_braces, close_braces)
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def validate_mindmap(content: str, fail_fast: bool = False) -> Tuple[bool, Tuple[str, ...]]:
+        """
+        Valida a sintaxe de um mindmap Mermaid, incluindo a regra de não usar parênteses/colchetes.
+        
+        Com fail_fast=True retorna no primeiro erro (checagens mais baratas primeiro),
+        evitando percorrer todo o conteúdo quando a resposta do LLM é inválida.
+        
+        Os erros vêm em tupla (imutável), já que o resultado é compartilhado pelo cache.
+        """
+        pending = MermaidValidator._iter_errors(content)
+        
+        if fail_fast:
+            first = next(pending, None)
+            return first is None, (() if first is None else (first,))
+        
+        errors = tuple(pending)
         return len(errors) == 0, errors
     
     @staticmethod
+    def is_valid(content: str) -> bool:
+        """Retorna só se o mindmap é válido, parando no primeiro erro."""
+        return next(MermaidValidator._iter_errors(content), None) is None
+    
+    @staticmethod
+    @lru_cache(maxsize=128)
     def fix_common_issues(content: str) -> str:
         """
         Corrige problemas comuns de sintaxe, incluindo a substituição de parênteses e colchetes.
         """
-        content = re.sub(r'^```mermaid\s*', '', content, flags=re.MULTILINE)
-        content = re.sub(r'\s*```$', '', content, flags=re.MULTILINE)
-        content = content.replace('\r\n', '\n')
-        content = re.sub(r'::icon\s*\(\s*fa\s+fa-', '::icon(fa fa-', content)
+        # Caminho rápido: conteúdo já no formato corrigido (caso comum na saída do LLM)
+        if _RE_NEEDS_FIX.search(content) is None:
+            return content.strip()
         
-        lines = content.split('\n')
-        processed_lines = []
+        content = _RE_FENCE_OPEN.sub('', content)
+        content = _RE_FENCE_CLOSE.sub('', content)
+        content = _RE_ICON_SPACES.sub('::icon(fa fa-', content)
         
-        for line in lines:
-            stripped_line = line.strip()
+        processed_lines: List[str] = []
+        blank_run = 0
+        
+        # Passada única: linhas vazias + substituição de colchetes + rstrip
+        # (o rstrip também remove o '\r' que sobra das quebras CRLF)
+        for line in content.split('\n'):
+            # Linha vazia (LF ou CRLF): mantém só a primeira de cada sequência,
+            # o mesmo que colapsar \n{3,} em \n\n
+            if not line or line == '\r':
+                blank_run += 1
+                if blank_run == 1:
+                    processed_lines.append('')
+                continue
+            blank_run = 0
             
-            if stripped_line.startswith('::icon('):
-                processed_lines.append(line)
+            if line.lstrip().startswith('::icon('):
+                processed_lines.append(line.rstrip())
                 continue
             
-            modified_line = line.replace('(', '-').replace(')', '-').replace('[', '-').replace(']', '-')
-            processed_lines.append(modified_line)
+            # Só substitui quando há o que substituir (replace encadeado é
+            # bem mais rápido que str.translate, principalmente com acentos)
+            if '(' in line or ')' in line or '[' in line or ']' in line:
+                line = line.replace('(', '-').replace(')', '-').replace('[', '-').replace(']', '-')
+            
+            processed_lines.append(line.rstrip())
             
         content = '\n'.join(processed_lines)
-        content = re.sub(r'\n{3,}', '\n\n', content)
-        lines = [line.rstrip() for line in content.split('\n')]
-        content = '\n'.join(lines)
         
         return content.strip()
+    
+    @classmethod
+    def cache_clear(cls):
+        """Esvazia os caches de validate_mindmap e fix_common_issues."""
+        cls.validate_mindmap.cache_clear()
+        cls.fix_common_issues.cache_clear()
+
+# Atalhos em nível de módulo: evitam o lookup de atributo na classe a cada
+# chamada. Pelo acesso via classe o staticmethod já vem desembrulhado
+# (com o cache LRU), então não há .__func__ a extrair.
+validate_mindmap = MermaidValidator.validate_mindmap
+fix_common_issues = MermaidValidator.fix_common_issues
+is_valid = MermaidValidator.is_valid
+
+def _process_one(filepath_str: str, overwrite: bool) -> Tuple[str, bool, bool, List[str], bool]:
+    """
+    Corrige e valida um arquivo .mmd (unidade de trabalho da CLI).
+    
+    Cada arquivo é independente, então a CLI distribui as chamadas
+    entre processos.
+    
+    Returns:
+        Tuple (nome, encontrado, válido, erros, corrigido)
+    """
+    filepath = Path(filepath_str)
+    if not filepath.exists() or not filepath.is_file():
+        return str(filepath), False, False, [], False
+    
+    original_content = filepath.read_text(encoding='utf-8')
+    
+    # Corrige o conteúdo
+    corrected_content = fix_common_issues(original_content)
+    
+    # Valida o conteúdo corrigido
+    valid, errors = validate_mindmap(corrected_content)
+    
+    changed = original_content != corrected_content
+    if changed and overwrite:
+        filepath.write_text(corrected_content, encoding='utf-8')
+    
+    return filepath.name, True, valid, list(errors), changed
 
 # --- BLOCO ADICIONADO PARA EXECUÇÃO VIA LINHA DE COMANDO ---
 if __name__ == "__main__":
@@ -82,33 +229,37 @@ if __name__ == "__main__":
     
     args = parser.parse_args()
     
-    for filepath_str in args.files:
-        filepath = Path(filepath_str)
-        if not filepath.exists() or not filepath.is_file():
-            print(f"ERRO: Arquivo não encontrado: {filepath}")
-            continue
-
-        print(f"--- Processando: {filepath.name} ---")
-        original_content = filepath.read_text(encoding='utf-8')
-        
-        # Corrige o conteúdo
-        corrected_content = MermaidValidator.fix_common_issues(original_content)
-        
-        # Valida o conteúdo corrigido
-        is_valid, errors = MermaidValidator.validate_mindmap(corrected_content)
-        
-        if is_valid:
-            print("Status: ✅ Válido")
+    process = partial(_process_one, overwrite=args.overwrite)
+    
+    results: Iterator[Tuple[str, bool, bool, List[str], bool]]
+    
+    with ExitStack() as stack:
+        # Um único arquivo não compensa subir o pool de processos
+        if len(args.files) == 1:
+            results = map(process, args.files)
         else:
-            print(f"Status: ❌ Inválido. Problemas encontrados:")
-            for error in errors:
-                print(f"  - {error}")
+            executor = stack.enter_context(ProcessPoolExecutor())
+            results = executor.map(process, args.files, chunksize=8)
         
-        if original_content != corrected_content:
-            print("INFO: Foram aplicadas correções no arquivo.")
-            if args.overwrite:
-                filepath.write_text(corrected_content, encoding='utf-8')
-                print("INFO: O arquivo foi sobrescrito com as correções.")
-        else:
-            print("INFO: Nenhuma correção foi necessária.")
-        print("-" * (len(filepath.name) + 14))
\ No newline at end of file
+        # Resultados chegam na ordem dos argumentos
+        for name, found, valid, errors, changed in results:
+            if not found:
+                print(f"ERRO: Arquivo não encontrado: {name}")
+                continue
+
+            print(f"--- Processando: {name} ---")
+            
+            if valid:
+                print("Status: ✅ Válido")
+            else:
+                print(f"Status: ❌ Inválido. Problemas encontrados:")
+                for error in errors:
+                    print(f"  - {error}")
+            
+            if changed:
+                print("INFO: Foram aplicadas correções no arquivo.")
+                if args.overwrite:
+                    print("INFO: O arquivo foi sobrescrito com as correções.")
+            else:
+                print("INFO: Nenhuma correção foi necessária.")
+            print("-" * (len(name) + 14))
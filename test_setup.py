@@ -118,6 +118,13 @@ def check_env_file():
     with open(env_path) as f:
         content = f.read()
     
+    # Lê o .env uma única vez em um dict (ignora comentários e linhas sem '=')
+    env = {}
+    for line in content.splitlines():
+        if '=' in line and not line.lstrip().startswith('#'):
+            key, _, value = line.partition('=')
+            env[key.strip()] = value.strip()
+    
     providers = {
         "OpenAI": "OPENAI_API_KEY",
         "Anthropic": "ANTHROPIC_API_KEY",
@@ -127,7 +134,7 @@ def check_env_file():
     
     configured = []
     for name, key in providers.items():
-        if key in content and len(content.split(f"{key}=")[1].split("\n")[0].strip()) > 10:
+        if len(env.get(key, '')) > 10:
             print(f"   ✅ {name}")
             configured.append(name)
         else:
@@ -0,0 +1,68 @@
+# tests/test_html_parser.py
+"""
+Garante que o parsing com lxml extrai o mesmo texto que o BeautifulSoup.
+"""
+
+import pytest
+from lxml import html as lxml_html
+
+from backend.services.html_parser import (
+    _UTF8_PARSER,
+    extract_fundamentacao,
+    normalize_text,
+    parse_html_file,
+)
+
+bs4 = pytest.importorskip("bs4")
+
+PARAGRAFO = "Texto da fundamentação teórica com conteúdo suficiente. " * 3
+
+FUNDAMENTACAO = (
+    '<section id="fundamentacao">'
+    "<h2>Titulo</h2>"
+    f"<p>{PARAGRAFO}</p>"
+    "<p>Texto &amp; um<script>var x = 1;</script> depois do script</p>"
+    "<style>.a{color:red}</style>"
+    "<!-- comentário -->"
+    "<p>Texto<br>dois</p>"
+    "<template>modelo <b>oculto</b></template>"
+    "<ul><li> item é </li></ul>"
+    "fim"
+    "</section>"
+)
+
+HTML = (
+    "<html><head><title>[Direito Civil] - [Contratos] - Parte 1</title></head>"
+    f"<body>{FUNDAMENTACAO}</body></html>"
+)
+
+
+def _texto_beautifulsoup(html: str) -> str:
+    """Resultado da implementação anterior (BeautifulSoup + get_text)."""
+    soup = bs4.BeautifulSoup(html, "lxml")
+    section = soup.find("section", id="fundamentacao")
+    return normalize_text(section.get_text(separator="\n", strip=True))
+
+
+def test_fundamentacao_igual_ao_beautifulsoup():
+    tree = lxml_html.document_fromstring(HTML.encode("utf-8"), parser=_UTF8_PARSER)
+
+    fundamentacao = extract_fundamentacao(tree)
+
+    assert fundamentacao == _texto_beautifulsoup(HTML)
+    assert "var x" not in fundamentacao
+    assert "color:red" not in fundamentacao
+    assert "depois do script" in fundamentacao
+
+
+def test_parse_html_file_aceita_declaracao_xml(tmp_path):
+    filepath = tmp_path / "com_declaracao.html"
+    filepath.write_bytes(
+        ('<?xml version="1.0" encoding="UTF-8"?>\n' + HTML).encode("utf-8")
+    )
+
+    dados = parse_html_file(filepath)
+
+    assert dados["ramo_direito"] == "Direito Civil"
+    assert dados["topico"] == "Contratos"
+    assert dados["fundamentacao"] == _texto_beautifulsoup(HTML)